@@ -5,446 +5,509 @@ Based on the proper boto3 patterns from AWS documentation
 """
 
 import boto3
+import functools
 import json
+import logging
+import secrets
+import sys
+import threading
 import time
-import random
-import string
-from datetime import datetime
-from pprint import pprint
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config
+from botocore.exceptions import ClientError
 
-class RetailGatewayDeployerBoto3:
-    def __init__(self, region='us-east-1'):
-        self.region = region
-        self.agentcore_client = boto3.client('bedrock-agentcore-control', region_name=region)
-        self.cognito_client = boto3.client('cognito-idp', region_name=region)
-        self.iam_client = boto3.client('iam', region_name=region)
-        
-        # Generate unique identifiers
-        self.unique_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
-        self.timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
-        
-    def generate_openapi_spec(self, api_base_url="https://api.yourcompany.com"):
-        """Generate the OpenAPI specification for the retail API"""
-        return {
-            "openapi": "3.0.0",
-            "info": {
-                "title": "Retail Demo API",
-                "description": "Comprehensive retail management API with orders, products, customers, and analytics",
-                "version": "1.0.0"
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+log = logging.getLogger(__name__)
+
+
+def _dumps(obj):
+    """Serialize obj to a compact JSON string, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(',', ':'))
+
+
+# Shared client configuration: a larger keep-alive connection pool and
+# adaptive retries so bursts of control-plane calls reuse connections and
+# back off cleanly when throttled. The read timeout stays at botocore's 60s
+# default: most calls here are non-idempotent creates, and a read timeout
+# that gets retried can leave a duplicate pool, client or role behind.
+_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    retries={'mode': 'adaptive', 'max_attempts': 10}
+)
+
+# Errors AgentCore returns while a newly created service role is still
+# propagating through IAM, and the longest single backoff sleep (seconds).
+_ROLE_PROPAGATION_ERRORS = ('ValidationException', 'AccessDeniedException')
+_MAX_BACKOFF = 16
+
+
+def _is_role_propagation_error(error):
+    """Whether a ClientError looks like the service cannot assume the role yet"""
+    if error.response['Error']['Code'] not in _ROLE_PROPAGATION_ERRORS:
+        return False
+    message = error.response['Error'].get('Message', '')
+    return 'not authorized' in message or 'role' in message.lower()
+
+
+# Longest sleep between gateway status polls (seconds)
+_MAX_POLL_INTERVAL = 30
+
+
+def _backoff_delays(initial, cap=None):
+    """Yield exponential backoff delays starting at initial, truncated at cap"""
+    delay = initial
+    while True:
+        yield delay
+        delay *= 2
+        if cap is not None:
+            delay = min(delay, cap)
+
+
+def _already_exists(error):
+    """Whether a Cognito ClientError reports that the resource already exists"""
+    # Cognito has no dedicated already-exists code for domains or resource
+    # servers; it reports them as InvalidParameterException
+    return (error.response['Error']['Code'] == 'InvalidParameterException'
+            and 'already' in error.response['Error'].get('Message', ''))
+
+
+# IAM policy documents for the gateway service role. They never vary, so
+# serialize them once.
+_TRUST_POLICY_JSON = _dumps({
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Principal": {
+                "Service": "bedrock-agentcore.amazonaws.com"
             },
-            "servers": [
-                {
-                    "url": api_base_url,
-                    "description": "EKS Retail API Server"
-                }
+            "Action": "sts:AssumeRole"
+        }
+    ]
+})
+
+_LOGS_POLICY_JSON = _dumps({
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Action": [
+                "logs:CreateLogGroup",
+                "logs:CreateLogStream",
+                "logs:PutLogEvents"
             ],
-            "paths": {
-                "/health": {
-                    "get": {
-                        "operationId": "checkHealth",
-                        "summary": "Health check endpoint",
-                        "description": "Check if the retail API service is healthy",
-                        "responses": {
-                            "200": {
-                                "description": "Service is healthy",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {
-                                            "type": "object",
-                                            "properties": {
-                                                "status": {"type": "string", "example": "healthy"},
-                                                "timestamp": {"type": "string", "format": "date-time"}
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                },
-                "/orders": {
-                    "get": {
-                        "operationId": "listOrders",
-                        "summary": "List all orders",
-                        "description": "Retrieve a list of all orders in the system",
-                        "responses": {
-                            "200": {
-                                "description": "List of orders",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {
-                                            "type": "object",
-                                            "properties": {
-                                                "orders": {
-                                                    "type": "array",
-                                                    "items": {"$ref": "#/components/schemas/Order"}
-                                                },
-                                                "count": {"type": "integer"}
-                                            }
-                                        }
-                                    }
+            "Resource": "arn:aws:logs:*:*:*"
+        }
+    ]
+})
+
+def _list_op(operation_id, summary, description, response_description, collection, schema_name):
+    """OpenAPI GET operation returning {<collection>: [<schema>], "count": n}"""
+    return {
+        "get": {
+            "operationId": operation_id,
+            "summary": summary,
+            "description": description,
+            "responses": {
+                "200": {
+                    "description": response_description,
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {
+                                    collection: {
+                                        "type": "array",
+                                        "items": {"$ref": f"#/components/schemas/{schema_name}"}
+                                    },
+                                    "count": {"type": "integer"}
                                 }
                             }
                         }
                     }
-                },
-                "/order/{orderId}": {
-                    "get": {
-                        "operationId": "getOrder",
-                        "summary": "Get specific order",
-                        "description": "Retrieve details of a specific order by ID",
-                        "parameters": [
-                            {
-                                "name": "orderId",
-                                "in": "path",
-                                "required": True,
-                                "schema": {"type": "string"},
-                                "description": "The order ID"
-                            }
-                        ],
-                        "responses": {
-                            "200": {
-                                "description": "Order details",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {"$ref": "#/components/schemas/Order"}
-                                    }
-                                }
-                            },
-                            "404": {"description": "Order not found"}
+                }
+            }
+        }
+    }
+
+
+def _get_by_id_op(operation_id, summary, description, param_name, param_description,
+                  response_description, not_found_description, schema_name):
+    """OpenAPI GET operation returning a single <schema> looked up by path ID"""
+    return {
+        "get": {
+            "operationId": operation_id,
+            "summary": summary,
+            "description": description,
+            "parameters": [
+                {
+                    "name": param_name,
+                    "in": "path",
+                    "required": True,
+                    "schema": {"type": "string"},
+                    "description": param_description
+                }
+            ],
+            "responses": {
+                "200": {
+                    "description": response_description,
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": f"#/components/schemas/{schema_name}"}
                         }
                     }
                 },
-                "/order": {
-                    "post": {
-                        "operationId": "createOrder",
-                        "summary": "Create new order",
-                        "description": "Create a new order with customer and item information",
-                        "requestBody": {
-                            "required": True,
-                            "content": {
-                                "application/json": {
-                                    "schema": {
-                                        "type": "object",
-                                        "properties": {
-                                            "customer_id": {"type": "string", "description": "Customer identifier"},
-                                            "items": {
-                                                "type": "array",
-                                                "items": {
-                                                    "type": "object",
-                                                    "properties": {
-                                                        "product_id": {"type": "string"},
-                                                        "name": {"type": "string"},
-                                                        "quantity": {"type": "integer"},
-                                                        "price": {"type": "number"}
-                                                    }
-                                                }
-                                            }
-                                        },
-                                        "required": ["customer_id", "items"]
-                                    }
-                                }
-                            }
-                        },
-                        "responses": {
-                            "201": {
-                                "description": "Order created successfully",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {"$ref": "#/components/schemas/Order"}
+                "404": {"description": not_found_description}
+            }
+        }
+    }
+
+
+# OpenAPI specification for the retail API, built once at import time and
+# treated as read-only. generate_openapi_spec() hands out a shallow copy with
+# the server URL filled in.
+_OPENAPI_SPEC_TEMPLATE = {
+    "openapi": "3.0.0",
+    "info": {
+        "title": "Retail Demo API",
+        "description": "Comprehensive retail management API with orders, products, customers, and analytics",
+        "version": "1.0.0"
+    },
+    "servers": [
+        {
+            "url": "https://api.yourcompany.com",
+            "description": "EKS Retail API Server"
+        }
+    ],
+    "paths": {
+        "/health": {
+            "get": {
+                "operationId": "checkHealth",
+                "summary": "Health check endpoint",
+                "description": "Check if the retail API service is healthy",
+                "responses": {
+                    "200": {
+                        "description": "Service is healthy",
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "object",
+                                    "properties": {
+                                        "status": {"type": "string", "example": "healthy"},
+                                        "timestamp": {"type": "string", "format": "date-time"}
                                     }
                                 }
                             }
                         }
                     }
-                },
-                "/products": {
-                    "get": {
-                        "operationId": "listProducts",
-                        "summary": "List all products",
-                        "description": "Retrieve a list of all products in the catalog",
-                        "responses": {
-                            "200": {
-                                "description": "List of products",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {
+                }
+            }
+        },
+        "/orders": _list_op(
+            "listOrders", "List all orders",
+            "Retrieve a list of all orders in the system",
+            "List of orders", "orders", "Order"
+        ),
+        "/order/{orderId}": _get_by_id_op(
+            "getOrder", "Get specific order",
+            "Retrieve details of a specific order by ID",
+            "orderId", "The order ID", "Order details", "Order not found", "Order"
+        ),
+        "/order": {
+            "post": {
+                "operationId": "createOrder",
+                "summary": "Create new order",
+                "description": "Create a new order with customer and item information",
+                "requestBody": {
+                    "required": True,
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {
+                                    "customer_id": {"type": "string", "description": "Customer identifier"},
+                                    "items": {
+                                        "type": "array",
+                                        "items": {
                                             "type": "object",
                                             "properties": {
-                                                "products": {
-                                                    "type": "array",
-                                                    "items": {"$ref": "#/components/schemas/Product"}
-                                                },
-                                                "count": {"type": "integer"}
+                                                "product_id": {"type": "string"},
+                                                "name": {"type": "string"},
+                                                "quantity": {"type": "integer"},
+                                                "price": {"type": "number"}
                                             }
                                         }
                                     }
-                                }
+                                },
+                                "required": ["customer_id", "items"]
                             }
                         }
                     }
                 },
-                "/product/{productId}": {
-                    "get": {
-                        "operationId": "getProduct",
-                        "summary": "Get specific product",
-                        "description": "Retrieve details of a specific product by ID",
-                        "parameters": [
-                            {
-                                "name": "productId",
-                                "in": "path",
-                                "required": True,
-                                "schema": {"type": "string"},
-                                "description": "The product ID"
+                "responses": {
+                    "201": {
+                        "description": "Order created successfully",
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/Order"}
                             }
-                        ],
-                        "responses": {
-                            "200": {
-                                "description": "Product details",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {"$ref": "#/components/schemas/Product"}
-                                    }
-                                }
-                            },
-                            "404": {"description": "Product not found"}
                         }
                     }
-                },
-                "/customers": {
-                    "get": {
-                        "operationId": "listCustomers",
-                        "summary": "List all customers",
-                        "description": "Retrieve a list of all customers",
-                        "responses": {
-                            "200": {
-                                "description": "List of customers",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {
-                                            "type": "object",
-                                            "properties": {
-                                                "customers": {
-                                                    "type": "array",
-                                                    "items": {"$ref": "#/components/schemas/Customer"}
-                                                },
-                                                "count": {"type": "integer"}
+                }
+            }
+        },
+        "/products": _list_op(
+            "listProducts", "List all products",
+            "Retrieve a list of all products in the catalog",
+            "List of products", "products", "Product"
+        ),
+        "/product/{productId}": _get_by_id_op(
+            "getProduct", "Get specific product",
+            "Retrieve details of a specific product by ID",
+            "productId", "The product ID", "Product details", "Product not found", "Product"
+        ),
+        "/customers": _list_op(
+            "listCustomers", "List all customers",
+            "Retrieve a list of all customers",
+            "List of customers", "customers", "Customer"
+        ),
+        "/customer/{customerId}": _get_by_id_op(
+            "getCustomer", "Get specific customer",
+            "Retrieve details of a specific customer by ID",
+            "customerId", "The customer ID", "Customer details", "Customer not found", "Customer"
+        ),
+        "/inventory": {
+            "get": {
+                "operationId": "getInventory",
+                "summary": "Check inventory levels",
+                "description": "Retrieve current inventory levels for all products",
+                "responses": {
+                    "200": {
+                        "description": "Inventory information",
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "object",
+                                    "properties": {
+                                        "inventory": {
+                                            "type": "array",
+                                            "items": {
+                                                "type": "object",
+                                                "properties": {
+                                                    "product_id": {"type": "string"},
+                                                    "name": {"type": "string"},
+                                                    "stock": {"type": "integer"}
+                                                }
                                             }
-                                        }
+                                        },
+                                        "total_products": {"type": "integer"}
                                     }
                                 }
                             }
                         }
                     }
-                },
-                "/customer/{customerId}": {
-                    "get": {
-                        "operationId": "getCustomer",
-                        "summary": "Get specific customer",
-                        "description": "Retrieve details of a specific customer by ID",
-                        "parameters": [
-                            {
-                                "name": "customerId",
-                                "in": "path",
-                                "required": True,
-                                "schema": {"type": "string"},
-                                "description": "The customer ID"
-                            }
-                        ],
-                        "responses": {
-                            "200": {
-                                "description": "Customer details",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {"$ref": "#/components/schemas/Customer"}
-                                    }
-                                }
-                            },
-                            "404": {"description": "Customer not found"}
-                        }
-                    }
-                },
-                "/inventory": {
-                    "get": {
-                        "operationId": "getInventory",
-                        "summary": "Check inventory levels",
-                        "description": "Retrieve current inventory levels for all products",
-                        "responses": {
-                            "200": {
-                                "description": "Inventory information",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {
-                                            "type": "object",
-                                            "properties": {
-                                                "inventory": {
-                                                    "type": "array",
-                                                    "items": {
-                                                        "type": "object",
-                                                        "properties": {
-                                                            "product_id": {"type": "string"},
-                                                            "name": {"type": "string"},
-                                                            "stock": {"type": "integer"}
-                                                        }
-                                                    }
-                                                },
-                                                "total_products": {"type": "integer"}
-                                            }
-                                        }
+                }
+            }
+        },
+        "/analytics/sales": {
+            "get": {
+                "operationId": "getSalesAnalytics",
+                "summary": "Get sales analytics",
+                "description": "Retrieve sales analytics and metrics",
+                "responses": {
+                    "200": {
+                        "description": "Sales analytics data",
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "object",
+                                    "properties": {
+                                        "total_sales": {"type": "number", "description": "Total sales amount"},
+                                        "completed_orders": {"type": "integer", "description": "Number of completed orders"},
+                                        "average_order_value": {"type": "number", "description": "Average order value"}
                                     }
                                 }
                             }
                         }
                     }
-                },
-                "/analytics/sales": {
-                    "get": {
-                        "operationId": "getSalesAnalytics",
-                        "summary": "Get sales analytics",
-                        "description": "Retrieve sales analytics and metrics",
-                        "responses": {
-                            "200": {
-                                "description": "Sales analytics data",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {
-                                            "type": "object",
-                                            "properties": {
-                                                "total_sales": {"type": "number", "description": "Total sales amount"},
-                                                "completed_orders": {"type": "integer", "description": "Number of completed orders"},
-                                                "average_order_value": {"type": "number", "description": "Average order value"}
-                                            }
-                                        }
-                                    }
-                                }
+                }
+            }
+        },
+        "/purchase": {
+            "post": {
+                "operationId": "createPurchase",
+                "summary": "Process purchase",
+                "description": "Process a purchase transaction for an order",
+                "requestBody": {
+                    "required": True,
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {
+                                    "order_id": {"type": "string", "description": "Order identifier"},
+                                    "amount": {"type": "number", "description": "Purchase amount"},
+                                    "payment_method": {"type": "string", "description": "Payment method (e.g., credit_card)"}
+                                },
+                                "required": ["order_id", "amount"]
                             }
                         }
                     }
                 },
-                "/purchase": {
-                    "post": {
-                        "operationId": "createPurchase",
-                        "summary": "Process purchase",
-                        "description": "Process a purchase transaction for an order",
-                        "requestBody": {
-                            "required": True,
-                            "content": {
-                                "application/json": {
-                                    "schema": {
-                                        "type": "object",
-                                        "properties": {
-                                            "order_id": {"type": "string", "description": "Order identifier"},
-                                            "amount": {"type": "number", "description": "Purchase amount"},
-                                            "payment_method": {"type": "string", "description": "Payment method (e.g., credit_card)"}
-                                        },
-                                        "required": ["order_id", "amount"]
-                                    }
-                                }
-                            }
-                        },
-                        "responses": {
-                            "201": {
-                                "description": "Purchase processed successfully",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {"$ref": "#/components/schemas/Purchase"}
-                                    }
-                                }
+                "responses": {
+                    "201": {
+                        "description": "Purchase processed successfully",
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/Purchase"}
                             }
                         }
                     }
-                },
-                "/purchases": {
-                    "get": {
-                        "operationId": "listPurchases",
-                        "summary": "List all purchases",
-                        "description": "Retrieve a list of all purchase transactions",
-                        "responses": {
-                            "200": {
-                                "description": "List of purchases",
-                                "content": {
-                                    "application/json": {
-                                        "schema": {
-                                            "type": "object",
-                                            "properties": {
-                                                "purchases": {
-                                                    "type": "array",
-                                                    "items": {"$ref": "#/components/schemas/Purchase"}
-                                                },
-                                                "count": {"type": "integer"}
-                                            }
-                                        }
-                                    }
-                                }
+                }
+            }
+        },
+        "/purchases": _list_op(
+            "listPurchases", "List all purchases",
+            "Retrieve a list of all purchase transactions",
+            "List of purchases", "purchases", "Purchase"
+        )
+    },
+    "components": {
+        "schemas": {
+            "Order": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string", "description": "Order identifier"},
+                    "customer_id": {"type": "string", "description": "Customer identifier"},
+                    "items": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "product_id": {"type": "string"},
+                                "name": {"type": "string"},
+                                "quantity": {"type": "integer"},
+                                "price": {"type": "number"}
                             }
                         }
-                    }
+                    },
+                    "total": {"type": "number", "description": "Total order amount"},
+                    "status": {"type": "string", "enum": ["pending", "completed", "cancelled"]},
+                    "created_at": {"type": "string", "format": "date-time"}
                 }
             },
-            "components": {
-                "schemas": {
-                    "Order": {
-                        "type": "object",
-                        "properties": {
-                            "id": {"type": "string", "description": "Order identifier"},
-                            "customer_id": {"type": "string", "description": "Customer identifier"},
-                            "items": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "product_id": {"type": "string"},
-                                        "name": {"type": "string"},
-                                        "quantity": {"type": "integer"},
-                                        "price": {"type": "number"}
-                                    }
-                                }
-                            },
-                            "total": {"type": "number", "description": "Total order amount"},
-                            "status": {"type": "string", "enum": ["pending", "completed", "cancelled"]},
-                            "created_at": {"type": "string", "format": "date-time"}
-                        }
-                    },
-                    "Product": {
-                        "type": "object",
-                        "properties": {
-                            "id": {"type": "string", "description": "Product identifier"},
-                            "name": {"type": "string", "description": "Product name"},
-                            "price": {"type": "number", "description": "Product price"},
-                            "category": {"type": "string", "description": "Product category"},
-                            "stock": {"type": "integer", "description": "Available stock quantity"}
-                        }
-                    },
-                    "Customer": {
-                        "type": "object",
-                        "properties": {
-                            "id": {"type": "string", "description": "Customer identifier"},
-                            "name": {"type": "string", "description": "Customer name"},
-                            "email": {"type": "string", "format": "email", "description": "Customer email"},
-                            "phone": {"type": "string", "description": "Customer phone number"}
-                        }
-                    },
-                    "Purchase": {
-                        "type": "object",
-                        "properties": {
-                            "id": {"type": "string", "description": "Purchase identifier"},
-                            "order_id": {"type": "string", "description": "Associated order ID"},
-                            "payment_method": {"type": "string", "description": "Payment method used"},
-                            "payment_status": {"type": "string", "enum": ["pending", "completed", "failed"]},
-                            "amount": {"type": "number", "description": "Purchase amount"},
-                            "transaction_id": {"type": "string", "description": "Transaction identifier"},
-                            "processed_at": {"type": "string", "format": "date-time"}
-                        }
-                    }
+            "Product": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string", "description": "Product identifier"},
+                    "name": {"type": "string", "description": "Product name"},
+                    "price": {"type": "number", "description": "Product price"},
+                    "category": {"type": "string", "description": "Product category"},
+                    "stock": {"type": "integer", "description": "Available stock quantity"}
+                }
+            },
+            "Customer": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string", "description": "Customer identifier"},
+                    "name": {"type": "string", "description": "Customer name"},
+                    "email": {"type": "string", "format": "email", "description": "Customer email"},
+                    "phone": {"type": "string", "description": "Customer phone number"}
+                }
+            },
+            "Purchase": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string", "description": "Purchase identifier"},
+                    "order_id": {"type": "string", "description": "Associated order ID"},
+                    "payment_method": {"type": "string", "description": "Payment method used"},
+                    "payment_status": {"type": "string", "enum": ["pending", "completed", "failed"]},
+                    "amount": {"type": "number", "description": "Purchase amount"},
+                    "transaction_id": {"type": "string", "description": "Transaction identifier"},
+                    "processed_at": {"type": "string", "format": "date-time"}
                 }
             }
         }
+    }
+}
+
+
+class RetailGatewayDeployerBoto3:
+    def __init__(self, region='us-east-1'):
+        self.region = region
+        # One session so credential and endpoint resolution happen once
+        self._session = boto3.Session(region_name=region)
+        self._session_lock = threading.Lock()
+        
+        # Generate unique identifiers
+        self.unique_suffix = secrets.token_hex(4)
+        self.timestamp = time.strftime('%Y%m%d-%H%M%S')
+        
+        self._openapi_payloads = {}
+        # ARN of the service role created by this run, if any
+        self._created_role_arn = None
+        
+    def _create_client(self, service_name):
+        """Create a service client from the shared session"""
+        # Sessions are not thread-safe, and clients can first be touched
+        # from the deploy thread pool
+        with self._session_lock:
+            return self._session.client(service_name, config=_CLIENT_CONFIG)
+
+    @functools.cached_property
+    def agentcore_client(self):
+        return self._create_client('bedrock-agentcore-control')
+
+    @functools.cached_property
+    def cognito_client(self):
+        return self._create_client('cognito-idp')
+
+    @functools.cached_property
+    def iam_client(self):
+        return self._create_client('iam')
+
+    @functools.cached_property
+    def account_id(self):
+        """AWS account ID of the deploying credentials, looked up once via STS"""
+        return self._create_client('sts').get_caller_identity()['Account']
+
+    def generate_openapi_spec(self, api_base_url="https://api.yourcompany.com"):
+        """Generate the OpenAPI specification for the retail API
+
+        Only the top level is copied; nested objects are shared with the
+        module template, so deep-copy the result before mutating it.
+        """
+        spec = dict(_OPENAPI_SPEC_TEMPLATE)
+        spec["servers"] = [{"url": api_base_url, "description": "EKS Retail API Server"}]
+        return spec
+
+    def generate_openapi_payload(self, api_base_url="https://api.yourcompany.com"):
+        """Serialized OpenAPI specification, encoded once per API base URL"""
+        payload = self._openapi_payloads.get(api_base_url)
+        if payload is None:
+            payload = _dumps(self.generate_openapi_spec(api_base_url))
+            self._openapi_payloads[api_base_url] = payload
+        return payload
 
     def create_cognito_user_pool(self, gateway_name):
         """Create Cognito User Pool for OAuth authentication"""
-        print(f"Creating Cognito User Pool for {gateway_name}...")
+        log.info("Creating Cognito User Pool for %s...", gateway_name)
         
-        user_pool_name = f"{gateway_name}-user-pool-{self.unique_suffix}"
+        # All Cognito resource names for this deployment
+        suffix = self.unique_suffix
+        user_pool_name = f"{gateway_name}-user-pool-{suffix}"
+        domain_name = f"{gateway_name}-domain-{suffix}"
+        resource_server_name = f"{gateway_name}-resource-server"
+        scope_name = f"{gateway_name}/genesis-gateway:invoke"
+        client_name = f"{gateway_name}-client-{suffix}"
         
         try:
             # Create user pool
@@ -464,41 +527,22 @@ class RetailGatewayDeployerBoto3:
             )
             
             user_pool_id = user_pool_response['UserPool']['Id']
-            print(f"✅ Created User Pool: {user_pool_id}")
-            
-            # Create domain
-            domain_name = f"{gateway_name}-domain-{self.unique_suffix}"
-            try:
-                self.cognito_client.create_user_pool_domain(
-                    Domain=domain_name,
-                    UserPoolId=user_pool_id
+            log.info("✅ Created User Pool: %s", user_pool_id)
+            
+            # Domain and resource server only depend on the user pool, so
+            # create them concurrently. The resource server must exist before
+            # the app client can request its scope.
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                domain_future = executor.submit(
+                    self._create_user_pool_domain, user_pool_id, domain_name
                 )
-                print(f"✅ Created Domain: {domain_name}")
-            except Exception as e:
-                print(f"⚠️  Domain creation failed (may already exist): {e}")
-            
-            # Create resource server first
-            resource_server_name = f"{gateway_name}-resource-server"
-            scope_name = f"{gateway_name}/genesis-gateway:invoke"
-            
-            try:
-                self.cognito_client.create_resource_server(
-                    UserPoolId=user_pool_id,
-                    Identifier=gateway_name,
-                    Name=resource_server_name,
-                    Scopes=[
-                        {
-                            'ScopeName': 'genesis-gateway:invoke',
-                            'ScopeDescription': 'Invoke gateway tools'
-                        }
-                    ]
+                resource_server_future = executor.submit(
+                    self._create_resource_server, user_pool_id, gateway_name, resource_server_name
                 )
-                print(f"✅ Created Resource Server: {resource_server_name}")
-            except Exception as e:
-                print(f"⚠️  Resource server creation failed: {e}")
+                domain_future.result()
+                resource_server_future.result()
             
             # Create app client
-            client_name = f"{gateway_name}-client-{self.unique_suffix}"
             client_response = self.cognito_client.create_user_pool_client(
                 UserPoolId=user_pool_id,
                 ClientName=client_name,
@@ -512,7 +556,7 @@ class RetailGatewayDeployerBoto3:
             client_id = client_response['UserPoolClient']['ClientId']
             client_secret = client_response['UserPoolClient']['ClientSecret']
             
-            print(f"✅ Created App Client: {client_id}")
+            log.info("✅ Created App Client: %s", client_id)
             
             return {
                 'user_pool_id': user_pool_id,
@@ -524,10 +568,43 @@ class RetailGatewayDeployerBoto3:
                 'token_endpoint': f"https://{domain_name}.auth.{self.region}.amazoncognito.com/oauth2/token"
             }
             
-        except Exception as e:
-            print(f"❌ Failed to create Cognito resources: {e}")
+        except ClientError as e:
+            log.error("❌ Failed to create Cognito resources: %s", e)
             raise
 
+    def _create_user_pool_domain(self, user_pool_id, domain_name):
+        """Create the Cognito hosted domain used for the token endpoint"""
+        try:
+            self.cognito_client.create_user_pool_domain(
+                Domain=domain_name,
+                UserPoolId=user_pool_id
+            )
+            log.info("✅ Created Domain: %s", domain_name)
+        except ClientError as e:
+            if not _already_exists(e):
+                raise
+            log.warning("⚠️  Domain already exists, skipping: %s", e)
+
+    def _create_resource_server(self, user_pool_id, gateway_name, resource_server_name):
+        """Create the resource server that defines the gateway invoke scope"""
+        try:
+            self.cognito_client.create_resource_server(
+                UserPoolId=user_pool_id,
+                Identifier=gateway_name,
+                Name=resource_server_name,
+                Scopes=[
+                    {
+                        'ScopeName': 'genesis-gateway:invoke',
+                        'ScopeDescription': 'Invoke gateway tools'
+                    }
+                ]
+            )
+            log.info("✅ Created Resource Server: %s", resource_server_name)
+        except ClientError as e:
+            if not _already_exists(e):
+                raise
+            log.warning("⚠️  Resource server already exists, skipping: %s", e)
+
     def get_or_create_service_role(self):
         """Get or create IAM service role for AgentCore Gateway"""
         role_name = f"AmazonBedrockAgentCoreGatewayServiceRole-{self.unique_suffix}"
@@ -535,59 +612,34 @@ class RetailGatewayDeployerBoto3:
         try:
             # Try to get existing role
             response = self.iam_client.get_role(RoleName=role_name)
-            print(f"✅ Using existing IAM role: {role_name}")
+            log.info("✅ Using existing IAM role: %s", role_name)
             return response['Role']['Arn']
         except self.iam_client.exceptions.NoSuchEntityException:
             # Create new role
-            print(f"Creating IAM service role: {role_name}")
-            
-            trust_policy = {
-                "Version": "2012-10-17",
-                "Statement": [
-                    {
-                        "Effect": "Allow",
-                        "Principal": {
-                            "Service": "bedrock-agentcore.amazonaws.com"
-                        },
-                        "Action": "sts:AssumeRole"
-                    }
-                ]
-            }
+            log.info("Creating IAM service role: %s", role_name)
             
             response = self.iam_client.create_role(
                 RoleName=role_name,
-                AssumeRolePolicyDocument=json.dumps(trust_policy),
+                AssumeRolePolicyDocument=_TRUST_POLICY_JSON,
                 Description=f"Service role for AgentCore Gateway {role_name}"
             )
+            self.iam_client.get_waiter('role_exists').wait(
+                RoleName=role_name,
+                WaiterConfig={'Delay': 1, 'MaxAttempts': 15}
+            )
             
             # Create and attach a basic policy for AgentCore Gateway
-            policy_document = {
-                "Version": "2012-10-17",
-                "Statement": [
-                    {
-                        "Effect": "Allow",
-                        "Action": [
-                            "logs:CreateLogGroup",
-                            "logs:CreateLogStream",
-                            "logs:PutLogEvents"
-                        ],
-                        "Resource": "arn:aws:logs:*:*:*"
-                    }
-                ]
-            }
-            
             policy_name = f"AgentCoreGatewayPolicy-{self.unique_suffix}"
             try:
                 policy_response = self.iam_client.create_policy(
                     PolicyName=policy_name,
-                    PolicyDocument=json.dumps(policy_document),
+                    PolicyDocument=_LOGS_POLICY_JSON,
                     Description="Basic policy for AgentCore Gateway"
                 )
                 policy_arn = policy_response['Policy']['Arn']
             except self.iam_client.exceptions.EntityAlreadyExistsException:
                 # Policy already exists, get its ARN
-                account_id = boto3.client('sts').get_caller_identity()['Account']
-                policy_arn = f"arn:aws:iam::{account_id}:policy/{policy_name}"
+                policy_arn = f"arn:aws:iam::{self.account_id}:policy/{policy_name}"
             
             # Attach the policy
             self.iam_client.attach_role_policy(
@@ -595,34 +647,63 @@ class RetailGatewayDeployerBoto3:
                 PolicyArn=policy_arn
             )
             
-            print(f"✅ Created IAM role: {role_name}")
-            return response['Role']['Arn']
+            log.info("✅ Created IAM role: %s", role_name)
+            self._created_role_arn = response['Role']['Arn']
+            return self._created_role_arn
 
     def create_gateway(self, gateway_name, cognito_config, role_arn):
         """Create the AgentCore Gateway using boto3"""
-        print(f"Creating AgentCore Gateway: {gateway_name}")
+        log.info("Creating AgentCore Gateway: %s", gateway_name)
         
         try:
-            response = self.agentcore_client.create_gateway(
-                name=gateway_name,
-                description=f"Retail Demo API Gateway - {self.timestamp}",
-                roleArn=role_arn,
-                protocolType='MCP',
-                authorizerType='CUSTOM_JWT',
-                authorizerConfiguration={
-                    'customJWTAuthorizer': {
-                        'discoveryUrl': cognito_config['discovery_url'],
-                        'allowedClients': [cognito_config['client_id']]
-                    }
-                },
-                exceptionLevel='DEBUG'
-            )
+            # A role created by this run can take a while to become assumable
+            # by the service, so retry with exponential backoff while it
+            # propagates. Any other error is raised straight away.
+            role_is_new = role_arn == self._created_role_arn
+            delays = _backoff_delays(0.5)
+            while True:
+                try:
+                    response = self.agentcore_client.create_gateway(
+                        name=gateway_name,
+                        description=f"Retail Demo API Gateway - {self.timestamp}",
+                        roleArn=role_arn,
+                        protocolType='MCP',
+                        authorizerType='CUSTOM_JWT',
+                        authorizerConfiguration={
+                            'customJWTAuthorizer': {
+                                'discoveryUrl': cognito_config['discovery_url'],
+                                'allowedClients': [cognito_config['client_id']]
+                            }
+                        },
+                        exceptionLevel='DEBUG'
+                    )
+                    break
+                except self.agentcore_client.exceptions.ConflictException:
+                    # An earlier attempt (e.g. a botocore retry after a read
+                    # timeout) may already have created it. Only adopt a
+                    # gateway that uses this deployment's service role.
+                    existing = self._find_by_name(self.agentcore_client.list_gateways, gateway_name)
+                    if existing is None:
+                        raise
+                    response = self.agentcore_client.get_gateway(gatewayIdentifier=existing['gatewayId'])
+                    if response['roleArn'] != role_arn:
+                        raise
+                    log.info("   Gateway %s already exists for this deployment, reusing it", gateway_name)
+                    break
+                except ClientError as e:
+                    if not role_is_new or not _is_role_propagation_error(e):
+                        raise
+                    delay = next(delays)
+                    if delay > _MAX_BACKOFF:
+                        raise
+                    log.info("⏳ Waiting for IAM propagation (retrying in %.1fs)...", delay)
+                    time.sleep(delay)
             
             gateway_id = response['gatewayId']
             gateway_url = response['gatewayUrl']
             
-            print(f"✅ Created Gateway: {gateway_id}")
-            print(f"   URL: {gateway_url}")
+            log.info("✅ Created Gateway: %s", gateway_id)
+            log.info("   URL: %s", gateway_url)
             
             return {
                 'gateway_id': gateway_id,
@@ -631,40 +712,47 @@ class RetailGatewayDeployerBoto3:
             }
             
         except Exception as e:
-            print(f"❌ Failed to create gateway: {e}")
+            log.error("❌ Failed to create gateway: %s", e)
             raise
 
     def create_api_key_credential_provider(self):
         """Create API key credential provider for public API (empty key)"""
-        print("Creating API key credential provider...")
+        log.info("Creating API key credential provider...")
         
+        provider_name = f"retail-api-key-{self.unique_suffix}"
         try:
-            response = self.agentcore_client.create_api_key_credential_provider(
-                name=f"retail-api-key-{self.unique_suffix}",
-                apiKey="public-api-no-key-required"  # Placeholder for public API
-            )
+            try:
+                response = self.agentcore_client.create_api_key_credential_provider(
+                    name=provider_name,
+                    apiKey="public-api-no-key-required"  # Placeholder for public API
+                )
+            except self.agentcore_client.exceptions.ConflictException:
+                # Created by an earlier attempt of this deployment
+                response = self.agentcore_client.get_api_key_credential_provider(name=provider_name)
             
             provider_arn = response['credentialProviderArn']
-            print(f"✅ Created API Key Credential Provider: {provider_arn}")
+            log.info("✅ Created API Key Credential Provider: %s", provider_arn)
             return provider_arn
             
         except Exception as e:
-            print(f"❌ Failed to create API key credential provider: {e}")
+            log.error("❌ Failed to create API key credential provider: %s", e)
             raise
 
-    def create_openapi_target(self, gateway_id, openapi_spec):
-        """Create OpenAPI target for the gateway using boto3"""
-        print("Creating OpenAPI target...")
+    def create_openapi_target(self, gateway_id, openapi_payload, provider_arn):
+        """Create OpenAPI target for the gateway using boto3
+        
+        openapi_payload is the serialized spec from generate_openapi_payload()
+        and provider_arn the API key credential provider created by
+        create_api_key_credential_provider().
+        """
+        log.info("Creating OpenAPI target...")
         
         try:
-            # Create API key credential provider first
-            provider_arn = self.create_api_key_credential_provider()
-            
             # Target configuration for OpenAPI schema
             target_config = {
                 "mcp": {
                     "openApiSchema": {
-                        "inlinePayload": json.dumps(openapi_spec)
+                        "inlinePayload": openapi_payload
                     }
                 }
             }
@@ -682,48 +770,75 @@ class RetailGatewayDeployerBoto3:
                 }
             ]
             
-            response = self.agentcore_client.create_gateway_target(
-                gatewayIdentifier=gateway_id,
-                name=f"retail-api-target-{self.unique_suffix}",
-                description="Retail Demo API OpenAPI Target",
-                targetConfiguration=target_config,
-                credentialProviderConfigurations=credential_config
-            )
+            target_name = f"retail-api-target-{self.unique_suffix}"
+            try:
+                response = self.agentcore_client.create_gateway_target(
+                    gatewayIdentifier=gateway_id,
+                    name=target_name,
+                    description="Retail Demo API OpenAPI Target",
+                    targetConfiguration=target_config,
+                    credentialProviderConfigurations=credential_config
+                )
+            except self.agentcore_client.exceptions.ConflictException:
+                # Created by an earlier attempt of this deployment
+                response = self._find_by_name(
+                    self.agentcore_client.list_gateway_targets, target_name,
+                    gatewayIdentifier=gateway_id
+                )
+                if response is None:
+                    raise
             
             target_id = response['targetId']
-            print(f"✅ Created Target: {target_id}")
+            log.info("✅ Created Target: %s", target_id)
             
             return target_id
             
         except Exception as e:
-            print(f"❌ Failed to create target: {e}")
+            log.error("❌ Failed to create target: %s", e)
             raise
 
+    def _find_by_name(self, list_method, name, **kwargs):
+        """Return the item called name from a paginated AgentCore list call"""
+        while True:
+            response = list_method(**kwargs)
+            for item in response.get('items', []):
+                if item.get('name') == name:
+                    return item
+            if not response.get('nextToken'):
+                return None
+            kwargs['nextToken'] = response['nextToken']
+
     def wait_for_gateway_ready(self, gateway_id, max_wait_time=300):
         """Wait for gateway to be ready"""
-        print("Waiting for gateway to be ready...")
+        log.info("Waiting for gateway to be ready...")
         
-        start_time = time.time()
-        while time.time() - start_time < max_wait_time:
+        # Poll quickly at first so a fast transition is noticed promptly, then
+        # back off to avoid hammering GetGateway (and its throttles)
+        deadline = time.monotonic() + max_wait_time
+        delays = _backoff_delays(1.0, _MAX_POLL_INTERVAL)
+        while time.monotonic() < deadline:
             try:
                 response = self.agentcore_client.get_gateway(gatewayIdentifier=gateway_id)
                 status = response['status']
                 
                 if status == 'READY':
-                    print("✅ Gateway is ready!")
+                    log.info("✅ Gateway is ready!")
                     return True
                 elif status == 'FAILED':
-                    print("❌ Gateway creation failed!")
+                    log.error("❌ Gateway creation failed!")
                     return False
                 else:
-                    print(f"   Status: {status} - waiting...")
-                    time.sleep(10)
+                    log.info("   Status: %s - waiting...", status)
                     
             except Exception as e:
-                print(f"   Error checking status: {e}")
-                time.sleep(10)
+                log.warning("   Error checking status: %s", e)
+                # Keep polling after a transient error, but restart from a
+                # short delay rather than continuing to grow
+                delays = _backoff_delays(2.0, _MAX_POLL_INTERVAL)
+            
+            time.sleep(min(next(delays), max(0, deadline - time.monotonic())))
         
-        print("❌ Timeout waiting for gateway to be ready")
+        log.error("❌ Timeout waiting for gateway to be ready")
         return False
 
     def save_configuration(self, gateway_config, cognito_config, target_id, gateway_name):
@@ -749,7 +864,7 @@ class RetailGatewayDeployerBoto3:
         with open(config_filename, 'w') as f:
             json.dump(config, f, indent=2)
         
-        print(f"✅ Configuration saved to: {config_filename}")
+        log.info("✅ Configuration saved to: %s", config_filename)
         return config_filename
 
     def deploy(self, gateway_name=None, api_base_url="https://api.yourcompany.com"):
@@ -757,45 +872,47 @@ class RetailGatewayDeployerBoto3:
         if gateway_name is None:
             gateway_name = f"retail-demo-boto3-{self.unique_suffix}"
         
-        print(f"🚀 Starting boto3-based deployment of {gateway_name}")
-        print(f"   Timestamp: {self.timestamp}")
-        print(f"   Region: {self.region}")
-        print("=" * 60)
+        log.info("🚀 Starting boto3-based deployment of %s", gateway_name)
+        log.info("   Timestamp: %s", self.timestamp)
+        log.info("   Region: %s", self.region)
+        log.info("=" * 60)
         
         try:
-            # Step 1: Create Cognito resources
-            cognito_config = self.create_cognito_user_pool(gateway_name)
-            
-            # Step 2: Create/get IAM role
-            role_arn = self.get_or_create_service_role()
-            
-            # Wait for IAM propagation
-            print("⏳ Waiting for IAM propagation...")
-            time.sleep(30)
+            # Steps 1 & 2: Cognito resources and the IAM role are independent,
+            # so create them concurrently
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                cognito_future = executor.submit(self.create_cognito_user_pool, gateway_name)
+                role_future = executor.submit(self.get_or_create_service_role)
+                cognito_config = cognito_future.result()
+                role_arn = role_future.result()
             
             # Step 3: Create gateway
             gateway_config = self.create_gateway(gateway_name, cognito_config, role_arn)
             
-            # Step 4: Wait for gateway to be ready
-            if not self.wait_for_gateway_ready(gateway_config['gateway_id']):
-                raise Exception("Gateway failed to become ready")
+            # Step 4: Wait for gateway to be ready, creating the target's API
+            # key credential provider in the meantime
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                provider_future = executor.submit(self.create_api_key_credential_provider)
+                if not self.wait_for_gateway_ready(gateway_config['gateway_id']):
+                    raise Exception("Gateway failed to become ready")
+                provider_arn = provider_future.result()
             
             # Step 5: Create OpenAPI target
-            openapi_spec = self.generate_openapi_spec(api_base_url)
-            target_id = self.create_openapi_target(gateway_config['gateway_id'], openapi_spec)
+            openapi_payload = self.generate_openapi_payload(api_base_url)
+            target_id = self.create_openapi_target(gateway_config['gateway_id'], openapi_payload, provider_arn)
             
             # Step 6: Save configuration
             config_file = self.save_configuration(gateway_config, cognito_config, target_id, gateway_name)
             
-            print("\n" + "=" * 60)
-            print("🎉 Boto3-based deployment completed successfully!")
-            print(f"Gateway Name: {gateway_name}")
-            print(f"Gateway URL: {gateway_config['gateway_url']}")
-            print(f"Configuration: {config_file}")
-            print("\nNext steps:")
-            print("1. Test the gateway using the generated config file")
-            print("2. Integrate with QuickSuite using Machine-to-Machine OAuth")
-            print("3. Use the gateway tools in your agents")
+            log.info("\n" + "=" * 60)
+            log.info("🎉 Boto3-based deployment completed successfully!")
+            log.info("Gateway Name: %s", gateway_name)
+            log.info("Gateway URL: %s", gateway_config['gateway_url'])
+            log.info("Configuration: %s", config_file)
+            log.info("\nNext steps:")
+            log.info("1. Test the gateway using the generated config file")
+            log.info("2. Integrate with QuickSuite using Machine-to-Machine OAuth")
+            log.info("3. Use the gateway tools in your agents")
             
             return {
                 'gateway_config': gateway_config,
@@ -805,8 +922,8 @@ class RetailGatewayDeployerBoto3:
             }
             
         except Exception as e:
-            print(f"\n❌ Deployment failed: {e}")
-            print("You may need to clean up partially created resources.")
+            log.error("\n❌ Deployment failed: %s", e)
+            log.info("You may need to clean up partially created resources.")
             raise
 
 def main():
@@ -820,6 +937,13 @@ def main():
     
     args = parser.parse_args()
     
+    # Print progress to stdout as before; leave the root logger alone so
+    # botocore's own INFO messages stay hidden
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    
     deployer = RetailGatewayDeployerBoto3(region=args.region)
     deployer.deploy(gateway_name=args.name, api_base_url=args.api_url)
 